@@ -4,13 +4,97 @@ Flood predictor wrapper with lazy loading and robust fallbacks.
 
 from __future__ import annotations
 
+import functools
 import os
 import pickle
-from typing import List
+from typing import Any, List, Optional, Tuple
 
+import joblib
 import numpy as np
 
-from config.settings import MODEL_PATH, SCALER_PATH
+from config.settings import MODEL_PATH, ONNX_MODEL_PATH, SCALER_PATH
+
+try:
+    import onnxruntime as ort
+except ImportError:  # optional: fall back to the sklearn model
+    ort = None
+
+# [temp, humidity, rain_1h_mm, pressure, reports_in_vicinity, rainfall_next_3_hours]
+N_FEATURES = 6
+
+_LABELS = np.array(["Low", "Medium", "High"])
+_LABEL_MAP = {
+    "H": "High",
+    "h": "High",
+    "M": "Medium",
+    "m": "Medium",
+    "L": "Low",
+    "l": "Low",
+}
+
+# Heuristic score = rain_1h_mm + 0.5 * reports + 0.5 * rainfall_next_3_hours;
+# only these columns are read, so missing values elsewhere can't affect it
+_HEURISTIC_COLUMNS = [2, 4, 5]
+_HEURISTIC_WEIGHTS = np.array([1.0, 0.5, 0.5], dtype=np.float32)
+_HIGH_SCORE = 8.0
+_MEDIUM_SCORE = 2.0
+
+
+@functools.lru_cache(maxsize=1)
+def _read_artifacts() -> Tuple[Any, Any]:
+    """
+    Read (model, scaler) from disk once per process, so every
+    FloodPredictor in a worker shares the same loaded artifacts.
+    """
+    scaler = None
+    model = None
+    if os.path.exists(SCALER_PATH):
+        scaler = joblib.load(SCALER_PATH)
+    if os.path.exists(MODEL_PATH):
+        model = joblib.load(MODEL_PATH)
+    return model, scaler
+
+
+def _to_matrix(features) -> Optional[np.ndarray]:
+    """
+    Convert feature vectors into one contiguous float32 matrix.
+    Short or ragged rows are zero-padded to N_FEATURES columns.
+    Returns None if the input is not numeric.
+    """
+    try:
+        arr = np.asarray(features, dtype=np.float32)
+    except (ValueError, TypeError):
+        arr = None
+    if arr is None or arr.ndim != 2:
+        # Ragged rows: pad each one out to the expected width
+        try:
+            arr = np.array(
+                [
+                    list(vec[:N_FEATURES]) + [0.0] * (N_FEATURES - len(vec))
+                    for vec in features
+                ],
+                dtype=np.float32,
+            )
+        except (ValueError, TypeError):
+            return None
+    if arr.shape[1] < N_FEATURES:
+        # Missing trailing columns count as zero
+        arr = np.pad(arr, ((0, 0), (0, N_FEATURES - arr.shape[1])))
+    return arr
+
+
+def _heuristic_labels(arr: np.ndarray) -> List[str]:
+    """
+    Dummy heuristic: if rainfall or reports high -> bump risk.
+    Scores the whole batch at once; expected column order:
+    [temp, humidity, rain_1h_mm, pressure,
+     reports_in_vicinity, rainfall_next_3_hours]
+    """
+    score = arr[:, _HEURISTIC_COLUMNS] @ _HEURISTIC_WEIGHTS
+    # 0 = Low, 1 = Medium, 2 = High. A missing rain or report value gives a
+    # NaN score, which compares False and stays Low (as the per-row loop did)
+    codes = (score >= _MEDIUM_SCORE).astype(np.int8) + (score >= _HIGH_SCORE)
+    return _LABELS[codes].tolist()
 
 
 class FloodPredictor:
@@ -22,6 +106,12 @@ class FloodPredictor:
     def __init__(self) -> None:
         self._model = None
         self._scaler = None
+        # ONNX Runtime session, preferred over the sklearn model when present
+        self._session = None
+        self._session_input = None
+        # StandardScaler parameters for the inline transform fast path
+        self._mean = None
+        self._inv_scale = None
         self._load_artifacts()
 
     def _load_artifacts(self) -> None:
@@ -30,26 +120,57 @@ class FloodPredictor:
         Fall back to dummy behavior.
         """
         try:
-            if os.path.exists(SCALER_PATH):
-                with open(SCALER_PATH, "rb") as f:
-                    self._scaler = pickle.load(f)
-            if os.path.exists(MODEL_PATH):
-                with open(MODEL_PATH, "rb") as f:
-                    self._model = pickle.load(f)
-            if self._model is not None:
+            self._model, self._scaler = _read_artifacts()
+            self._snapshot_scaler()
+            self._load_onnx_session()
+            if self._session is not None:
+                print("--- FloodPredictor: loaded ONNX model artifacts ---")
+            elif self._model is not None:
                 print("--- FloodPredictor: loaded model artifacts ---")
             else:
                 print(
                     "--- FloodPredictor: model file missing; "
                     "using dummy predictions ---"
                 )
-        except (OSError, pickle.UnpicklingError) as e:
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError) as e:
             # On any load failure,
             # null out artifacts and continue in dummy mode
             print(f"⚠️ FloodPredictor: failed to load artifacts: {e}. " "Using dummy.")
             self._model = None
             self._scaler = None
 
+    def _load_onnx_session(self) -> None:
+        """
+        Create an ONNX Runtime session if onnxruntime is installed
+        and an exported model exists. Failures keep the sklearn path.
+        """
+        if ort is None or not os.path.exists(ONNX_MODEL_PATH):
+            return
+        try:
+            self._session = ort.InferenceSession(
+                ONNX_MODEL_PATH, providers=["CPUExecutionProvider"]
+            )
+            self._session_input = self._session.get_inputs()[0].name
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            print(f"⚠️ FloodPredictor: failed to load ONNX model: {e}. Using sklearn.")
+            self._session = None
+            self._session_input = None
+
+    def _snapshot_scaler(self) -> None:
+        """
+        Cache a StandardScaler's mean and reciprocal scale as contiguous
+        float32 arrays so transform becomes plain NumPy arithmetic.
+        Other scalers keep going through scaler.transform().
+        """
+        mean = getattr(self._scaler, "mean_", None)
+        scale = getattr(self._scaler, "scale_", None)
+        if mean is None or scale is None:
+            return
+        if not getattr(self._scaler, "with_mean", True):
+            mean = np.zeros_like(scale)
+        self._mean = np.ascontiguousarray(mean, dtype=np.float32)
+        self._inv_scale = np.ascontiguousarray(1.0 / np.asarray(scale), dtype=np.float32)
+
     def predict(self, features: List[List[float]]) -> List[str]:
         """
         Predict risk labels for a list of feature vectors.
@@ -59,59 +180,53 @@ class FloodPredictor:
             features and not isinstance(features[0], (list, tuple, np.ndarray))
         ):
             raise ValueError("features must be a list of feature vectors")
+        if not features:
+            return []
+
+        # Build the input matrix once; scaler, model and heuristic all share it
+        matrix = _to_matrix(features)
+        if matrix is None:
+            return ["Low"] * len(features)
 
-        if self._scaler is not None:
+        if self._mean is not None and matrix.shape[1] == self._mean.shape[0]:
+            # Same math as StandardScaler.transform without sklearn's validation
+            matrix = (matrix - self._mean) * self._inv_scale
+        elif self._scaler is not None:
             try:
-                features = self._scaler.transform(features)
+                matrix = self._scaler.transform(matrix)
             except (ValueError, RuntimeError) as e:
                 print(
                     f"⚠️ FloodPredictor: scaler.transform failed: {e}. "
                     "Proceeding without scaling."
                 )
 
-        if self._model is None:
-            # Dummy heuristic:
-            # if rainfall or reports high -> bump risk
-            preds = []
-            for vec in features:
-                try:
-                    # expected order:
-                    # [temp, humidity, rain_1h_mm, pressure,
-                    #  reports_in_vicinity, rainfall_next_3_hours]
-                    rain = float(vec[2]) if len(vec) > 2 else 0.0
-                    reports = float(vec[4]) if len(vec) > 4 else 0.0
-                    next3h = float(vec[5]) if len(vec) > 5 else 0.0
-                    score = rain + 0.5 * reports + 0.5 * next3h
-                    if score >= 8:
-                        preds.append("High")
-                    elif score >= 2:
-                        preds.append("Medium")
-                    else:
-                        preds.append("Low")
-                except (ValueError, IndexError, TypeError):
-                    preds.append("Low")
-            return preds
+        if self._model is None and self._session is None:
+            return _heuristic_labels(matrix)
 
         try:
-            raw = self._model.predict(features)
-            # Normalize to canonical labels
-            normalized = []
-            for r in raw:
-                if isinstance(r, bytes):
-                    r = r.decode("utf-8", errors="ignore")
-                label = str(r)
-                if label.lower().startswith("h"):
-                    normalized.append("High")
-                elif label.lower().startswith("m"):
-                    normalized.append("Medium")
-                elif label.lower().startswith("l"):
-                    normalized.append("Low")
-                else:
-                    normalized.append("Low")
-            return normalized
+            if self._session is not None:
+                raw = self._session.run(
+                    None, {self._session_input: matrix.astype(np.float32, copy=False)}
+                )[0]
+            else:
+                raw = self._model.predict(matrix)
+            if len(raw) and isinstance(raw[0], bytes):
+                # Decode the whole batch at once rather than per label
+                raw = np.char.decode(np.asarray(raw, dtype=bytes), "utf-8", "ignore")
+            # Normalize to canonical labels by first letter
+            return [_LABEL_MAP.get(str(r)[:1], "Low") for r in raw]
         except (ValueError, RuntimeError) as e:
             print(
                 f"⚠️ FloodPredictor: model.predict failed: {e}. "
                 "Falling back to dummy."
             )
             return ["Low"] * len(features)
+
+
+@functools.lru_cache(maxsize=1)
+def get_predictor() -> FloodPredictor:
+    """
+    Process-wide FloodPredictor, so the artifacts are loaded once per
+    worker. Each worker process still holds its own copy of them.
+    """
+    return FloodPredictor()
@@ -1,8 +1,10 @@
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
 from typing import Optional, List, Dict, Any  # Added Dict, Any for charts_data
 from datetime import datetime
 from enum import Enum
 
+from config.settings import MAX_REPORT_BATCH_SIZE
+
 
 # --- Enums for consistency and validation ---
 
@@ -66,9 +68,8 @@ class Report(ReportBase):
     # Added nlp_analysis as it's part of your report creation flow
     nlp_analysis: Dict[str, Any] = Field({}, description="NLP analysis results of the description")
 
-    class Config:
-        orm_mode = True  # This is usually for ORM integration, keep if intended
-        allow_population_by_field_name = True
+    # Pydantic v2 config; serialization runs in pydantic-core (Rust)
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 
 class ReportResponse(BaseModel):
@@ -78,6 +79,25 @@ class ReportResponse(BaseModel):
     data: Report
 
 
+class ReportBatchCreate(BaseModel):
+    """Model for submitting many flood reports in one request."""
+
+    reports: List[ReportCreate] = Field(
+        ..., min_length=1, max_length=MAX_REPORT_BATCH_SIZE
+    )
+
+
+class ReportBatchResponse(BaseModel):
+    """Response model for batch report submission."""
+
+    message: str
+    data: List[Report]
+    failed_indices: List[int] = Field(
+        default_factory=list,
+        description="Positions in the submitted batch that were not saved",
+    )
+
+
 # --- Alert Models ---
 
 
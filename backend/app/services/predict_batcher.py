@@ -0,0 +1,35 @@
+"""
+Micro-batched flood predictions for concurrent /risk requests
+"""
+
+from typing import List, Sequence
+
+from app.models.flood_predictor import FloodPredictor
+from app.utils.batcher import MicroBatcher
+
+
+class PredictBatcher:
+    """
+    Coalesce single-row predictions from concurrent requests into one
+    FloodPredictor.predict call, run off the event loop.
+    """
+
+    def __init__(
+        self, predictor: FloodPredictor, max_batch: int = 32, max_delay_ms: float = 5
+    ):
+        self._predictor = predictor
+        self._batcher = MicroBatcher(
+            self._predict_batch, max_batch=max_batch, max_delay_ms=max_delay_ms
+        )
+
+    def _predict_batch(self, rows: List[Sequence[float]]) -> List[str]:
+        """Predict every queued feature row in one call."""
+        return self._predictor.predict(rows)
+
+    async def submit(self, features: Sequence[float]) -> str:
+        """Predict the risk label for one feature row."""
+        return await self._batcher.submit(features)
+
+    async def close(self) -> None:
+        """Stop the background batching task."""
+        await self._batcher.close()
@@ -3,19 +3,266 @@ Risk assessment and NLP analysis service (with non-blocking NLP)
 """
 
 import asyncio
+import functools
+import math
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import spacy
-from typing import Dict, Any, List
+from cachetools import TTLCache
+from spacy.language import Language
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
 from datetime import datetime, timedelta, timezone  # Import for time filtering
-from app.utils.database import db
-from config.settings import RISK_THRESHOLDS
+from app.models.flood_predictor import N_FEATURES
+from app.models.schemas import (
+    AssessmentSource,
+    RiskAssessmentDetails,
+    RiskLevel,
+    RiskResponse,
+)
+from app.utils.batcher import MicroBatcher
+from app.utils.database import REPORTS_BBOX_INDEX, db
+from config.settings import RISK_THRESHOLDS, SPACY_THREAD_POOL_SIZE
+
+# Resolved once at import; RISK_THRESHOLDS never changes at runtime
+HIGH_WATER_LEVELS = frozenset(RISK_THRESHOLDS.get("HIGH_WATER_LEVEL", []))
+# Array form for $in filters, built once instead of per query
+HIGH_WATER_LEVELS_LIST = sorted(HIGH_WATER_LEVELS)
+
+# Radius used for "nearby" report searches
+NEARBY_RADIUS_M = 1000
+EARTH_RADIUS_M = 6378100
+# Metres per degree of latitude (and of longitude at the equator)
+M_PER_DEG = math.radians(1) * EARTH_RADIUS_M
+# Farthest a report can be from a point and still count toward its
+# assessment: the ±0.01° bounding box corner is ~1.57 km away
+REPORT_INFLUENCE_M = 1600
+
+# Look-back windows. The weather window also bounds the ML report count;
+# both are compared against BSON dates so the created_at/fetched_at
+# indexes serve them as range seeks.
+RECENT_REPORT_WINDOW = timedelta(hours=24)
+RECENT_WEATHER_WINDOW = timedelta(hours=3)
+
+# Only the weather fields read by _weather_features
+WEATHER_FEATURE_PROJECTION = {
+    "_id": 0,
+    "current_weather.temp": 1,
+    "current_weather.humidity": 1,
+    "current_weather.rain_1h_mm": 1,
+    "current_weather.pressure": 1,
+    "rainfall_next_3h": 1,
+    "fetched_at": 1,
+}
+
+# Latest weather snapshot shared by all requests (refreshed after the TTL),
+# with the `since` bound it was queried for; one request refreshes it at a time
+WEATHER_CACHE_TTL_S = 30
+_WEATHER_CACHE: Dict[str, Any] = {"doc": None, "ts": -math.inf, "since": None}
+_WEATHER_LOCK = asyncio.Lock()
+
+RECOMMENDATIONS = {
+    RiskLevel.LOW: "Conditions appear safe. Remain aware of weather changes.",
+    RiskLevel.MEDIUM: "Potential for localized flooding. Exercise caution.",
+    RiskLevel.HIGH: "High flood risk detected. Avoid travel in this area.",
+    RiskLevel.UNKNOWN: "Could not determine risk. Please check conditions manually.",
+}
+
+# Model labels that map onto an ML assessment; anything else is Unknown
+ML_RISK_LEVELS = {"High": RiskLevel.HIGH, "Low": RiskLevel.LOW}
+
+# Severity rank used to combine the threshold and ML assessments
+RISK_RANK = {RiskLevel.MEDIUM: 1, RiskLevel.HIGH: 2}
+FINAL_RISK_BY_RANK = (RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH)
+
+# The one /risk response cache: final responses keyed by grid bucket (see
+# grid_key). Buckets are ~165 m on a side, so every point in one is within
+# ~235 m of the point its cached response was computed for.
+LOCATION_CACHE_TTL_S = 60
+LOCATION_BUCKET_DEG = 0.0015
+_LOCATION_CACHE = TTLCache(maxsize=10_000, ttl=LOCATION_CACHE_TTL_S)
+# Assessments being computed, so concurrent misses for a bucket share one
+_IN_FLIGHT: "Dict[Tuple[int, int], asyncio.Task]" = {}
+
+# Reports invalidated in the last REPORT_LOG_RETAIN_S seconds as
+# (sequence number, monotonic time, lat, lon). An assessment notes the
+# sequence number before querying and is not cached if a report within
+# reach arrived meanwhile, since its counts may predate that report.
+REPORT_LOG_RETAIN_S = 60
+_REPORT_LOG: "deque[Tuple[int, float, float, float]]" = deque()
+_REPORT_SEQ = {"last": 0, "pruned": 0}
+
+# Dedicated pool for spaCy work so bursts of reports cannot starve
+# the event loop's shared default executor; sized by SPACY_THREAD_POOL_SIZE
+_NLP_EXECUTOR = ThreadPoolExecutor(
+    max_workers=SPACY_THREAD_POOL_SIZE, thread_name_prefix="spacy"
+)
+
+# (severity, locations, actionable_words) for one normalized description
+Summary = Tuple[str, Tuple[str, ...], Tuple[str, ...]]
+
+# Parsed descriptions, most recently used last; shared by all NLP threads
+ANALYSIS_CACHE_SIZE = 4096
+_ANALYSIS_CACHE: "OrderedDict[str, Summary]" = OrderedDict()
+_ANALYSIS_CACHE_LOCK = threading.Lock()
+_ANALYSIS_CACHE_STATS = {"hits": 0, "misses": 0}
+
+# Severity keywords with their inflected forms; matched on whole words
+# of the lowercased text, so no tokenizer or lemmatizer is involved
+HIGH_RISK_WORDS = frozenset(
+    [
+        "stick", "sticks", "sticking", "stuck",
+        "submerge", "submerges", "submerged", "submerging",
+        "block", "blocks", "blocked", "blocking",
+        "trap", "traps", "trapped", "trapping",
+        "enter", "enters", "entered", "entering",
+        "dangerous",
+        "impassable",
+        "wash", "washes", "washed", "washing",
+        "collapsed",
+    ]
+)
+MEDIUM_RISK_WORDS = frozenset(
+    [
+        "rise", "rises", "rising", "rose", "risen",
+        "overflow", "overflows", "overflowed", "overflowing", "overflown",
+        "waterlog", "waterlogs", "waterlogged", "waterlogging",
+        "struggle", "struggles", "struggled", "struggling",
+        "difficult",
+        "stagnant",
+    ]
+)
+
+# One alternation for both levels; the named group tells them apart.
+# Longest words first so e.g. "overflowing" wins over "overflow".
+_SEVERITY_RE = re.compile(
+    r"\b(?:(?P<high>{})|(?P<medium>{}))\b".format(
+        "|".join(sorted(HIGH_RISK_WORDS, key=len, reverse=True)),
+        "|".join(sorted(MEDIUM_RISK_WORDS, key=len, reverse=True)),
+    )
+)
+
+# Entity labels reported as extracted locations
+LOCATION_LABELS = frozenset(["GPE", "LOC", "FAC"])
 
-# Load the spaCy model once when the service is initialized
-try:
-    nlp = spacy.load("en_core_web_sm")
+_NLP_LOAD_LOCK = threading.Lock()
+
+
+def get_nlp() -> Optional[Language]:
+    """
+    Load the spaCy NER pipeline on first use instead of at import, so workers
+    that never analyze a description never pay for the model. Returns None
+    if the model is missing.
+    """
+    # Serialize the first load; later calls are an lru_cache hit
+    with _NLP_LOAD_LOCK:
+        return _load_nlp()
+
+
+@functools.lru_cache(maxsize=1)
+def _load_nlp() -> Optional[Language]:
+    """
+    Entities are the only thing spaCy is still needed for, so the trained
+    pipeline is trimmed down to its NER component (which carries its own
+    tok2vec in en_core_web_sm).
+    """
+    try:
+        nlp = spacy.load(
+            "en_core_web_sm",
+            exclude=["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer"],
+        )
+    except OSError:
+        print("❌ spaCy model not found. Please run 'python -m spacy download en_core_web_sm'")
+        return None
     print("✅ Successfully loaded spaCy model 'en_core_web_sm'")
-except OSError:
-    print("❌ spaCy model not found. Please run 'python -m spacy download en_core_web_sm'")
-    nlp = None
+    return nlp
+
+
+def _text_severity(text: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Severity and matched keywords for a lowercased description.
+    Any high-risk word makes it "high"; medium-risk words only count
+    until the first high-risk word is seen.
+    """
+    severity = "low"
+    actionable_words = set()
+
+    for match in _SEVERITY_RE.finditer(text):
+        if match.lastgroup == "high":
+            severity = "high"
+            actionable_words.add(match.group())
+        elif severity != "high":
+            severity = "medium"
+            actionable_words.add(match.group())
+
+    return severity, tuple(actionable_words)
+
+
+def _summarize_doc(text: str, ent_doc) -> Tuple[str, Tuple[str, ...], Tuple[str, ...]]:
+    """Extract (severity, locations, actionable_words) for one description."""
+    entities = {ent.text for ent in ent_doc.ents if ent.label_ in LOCATION_LABELS}
+    severity, actionable_words = _text_severity(text)
+    return severity, tuple(entities), actionable_words
+
+
+def _summarize_texts(nlp: Language, texts: List[str]) -> List[Summary]:
+    """
+    Summaries for normalized descriptions. Results are cached (as immutable
+    tuples) so repeated descriptions skip the parse entirely; the distinct
+    uncached ones are parsed together through nlp.pipe.
+    """
+    with _ANALYSIS_CACHE_LOCK:
+        summaries = {}
+        # Counted per distinct text: repeats within a call are parsed once
+        for text in dict.fromkeys(texts):
+            if text in _ANALYSIS_CACHE:
+                _ANALYSIS_CACHE.move_to_end(text)
+                summaries[text] = _ANALYSIS_CACHE[text]
+        missing = [text for text in dict.fromkeys(texts) if text not in summaries]
+        _ANALYSIS_CACHE_STATS["hits"] += len(summaries)
+        _ANALYSIS_CACHE_STATS["misses"] += len(missing)
+
+    if missing:
+        parsed = map(_summarize_doc, missing, nlp.pipe(missing, batch_size=64))
+        with _ANALYSIS_CACHE_LOCK:
+            for text, summary in zip(missing, parsed):
+                summaries[text] = _ANALYSIS_CACHE[text] = summary
+            while len(_ANALYSIS_CACHE) > ANALYSIS_CACHE_SIZE:
+                _ANALYSIS_CACHE.popitem(last=False)
+
+    return [summaries[text] for text in texts]
+
+
+def analysis_cache_info() -> Dict[str, int]:
+    """Hit/miss counters and current size of the description cache."""
+    with _ANALYSIS_CACHE_LOCK:
+        return {
+            **_ANALYSIS_CACHE_STATS,
+            "size": len(_ANALYSIS_CACHE),
+            "maxsize": ANALYSIS_CACHE_SIZE,
+        }
+
+
+def _to_analysis(summary: Tuple[str, Tuple[str, ...], Tuple[str, ...]]) -> Dict[str, Any]:
+    """Build the public analysis dict from a cached summary tuple."""
+    severity, locations, actionable_words = summary
+    return {
+        "severity_from_text": severity,
+        "extracted_locations": list(locations),
+        "actionable_words": list(actionable_words),
+    }
+
+
+def _empty_analysis() -> Dict[str, Any]:
+    """Analysis returned when the spaCy model is unavailable."""
+    return {
+        "severity_from_text": "unknown",
+        "extracted_locations": [],
+        "actionable_words": [],
+    }
 
 
 def _run_spacy_analysis(description: str) -> Dict[str, Any]:
@@ -23,222 +270,509 @@ def _run_spacy_analysis(description: str) -> Dict[str, Any]:
     A synchronous wrapper for the CPU-bound spaCy analysis.
     This function will be run in a separate thread.
     """
+    nlp = get_nlp()
     if not nlp:
-        return {
-            "severity_from_text": "unknown",
-            "extracted_locations": [],
-            "actionable_words": [],
-        }  # Fixed key name
+        return _empty_analysis()
 
-    doc = nlp(description.lower())
+    return _to_analysis(_summarize_texts(nlp, [description.strip().lower()])[0])
 
-    entities = [ent.text for ent in doc.ents if ent.label_ in ["GPE", "LOC", "FAC"]]
 
-    severity = "low"
-    actionable_words = []
-
-    high_risk_lemmas = [
-        "stick",
-        "submerge",
-        "block",
-        "trap",
-        "enter",
-        "dangerous",
-        "impassable",
-        "wash",
-        "collapsed",
-    ]
-    medium_risk_lemmas = [
-        "rise",
-        "overflow",
-        "waterlog",
-        "struggle",
-        "difficult",
-        "stagnant",
-    ]
+def _run_spacy_analysis_batch(descriptions: List[str]) -> List[Dict[str, Any]]:
+    """
+    Batched variant of _run_spacy_analysis for bulk ingestion
+    and for the request micro-batcher.
+    """
+    nlp = get_nlp()
+    if not nlp:
+        return [_empty_analysis() for _ in descriptions]
+
+    texts = [description.strip().lower() for description in descriptions]
+    return [_to_analysis(summary) for summary in _summarize_texts(nlp, texts)]
+
+
+# Coalesces descriptions from concurrent requests into nlp.pipe calls,
+# one batch per NLP thread at a time
+_NLP_BATCHER = MicroBatcher(
+    _run_spacy_analysis_batch,
+    max_batch=32,
+    max_delay_ms=10,
+    executor=_NLP_EXECUTOR,
+    max_concurrency=SPACY_THREAD_POOL_SIZE,
+)
 
-    for token in doc:
-        if token.lemma_ in high_risk_lemmas:
-            severity = "high"
-            actionable_words.append(token.text)
-        elif token.lemma_ in medium_risk_lemmas and severity != "high":
-            severity = "medium"
-            actionable_words.append(token.text)
 
+async def close_nlp_batcher() -> None:
+    """Stop the NLP micro-batcher's background task (call on shutdown)."""
+    await _NLP_BATCHER.close()
+
+
+async def detect_geo_index(database) -> bool:
+    """
+    Check once (at startup) whether reports has a 2dsphere index on 'location',
+    so request handlers can pick the geo or bounding-box query up front.
+    """
+    try:
+        indexes = await database.get_collection("reports").index_information()
+    except Exception as e:
+        print(f"ℹ️ Could not inspect report indexes, using bbox queries: {e}")
+        return False
+    return any(
+        ("location", "2dsphere") in info.get("key", []) for info in indexes.values()
+    )
+
+
+async def detect_bbox_index(database) -> bool:
+    """
+    Check once (at startup) whether reports has the bounding-box index, so
+    queries only hint it when it really exists; a hint naming a missing
+    index fails the query outright.
+    """
+    try:
+        indexes = await database.get_collection("reports").index_information()
+    except Exception as e:
+        print(f"ℹ️ Could not inspect report indexes, not hinting bbox queries: {e}")
+        return False
+    return any(
+        [tuple(key) for key in info.get("key", [])] == REPORTS_BBOX_INDEX
+        for info in indexes.values()
+    )
+
+
+async def ensure_report_indexes(database) -> bool:
+    """
+    Create the report indexes at startup (a no-op when they already exist)
+    and return whether $geoWithin queries can be used. Reports saved before
+    the 'location' field existed are backfilled by
+    scripts/backfill_report_location.py, not here, so startup stays cheap.
+    """
+    reports_collection = database.get_collection("reports")
+    try:
+        await reports_collection.create_index(
+            [("location", "2dsphere"), ("created_at", -1)]
+        )
+        await reports_collection.create_index([("created_at", -1)])
+        print("✅ Report indexes are in place")
+        return True
+    except Exception as e:
+        print(f"⚠️ Could not create report indexes: {e}")
+        return await detect_geo_index(database)
+
+
+def distance_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distance in metres (equirectangular; plenty accurate at city scale)."""
+    dx = math.radians(lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+    dy = math.radians(lat2 - lat1)
+    return math.hypot(dx, dy) * EARTH_RADIUS_M
+
+
+def grid_key(lat: float, lon: float, step: float) -> Tuple[int, int]:
+    """Index of the grid bucket, `step` degrees on a side, containing (lat, lon)."""
+    return round(lat / step), round(lon / step)
+
+
+def cells_within(
+    lat: float, lon: float, reach_m: float, step: float
+) -> Set[Tuple[int, int]]:
+    """
+    grid_key of every `step`-degree bucket that can hold a point within
+    reach_m of (lat, lon). The square of buckets over-covers the circle,
+    so no bucket in reach is missed.
+    """
+    lat_span = reach_m / M_PER_DEG + step / 2
+    # Longitude degrees shrink towards the poles; use the band's widest span
+    cos_lat = math.cos(math.radians(min(abs(lat) + lat_span, 89.0)))
+    lon_span = reach_m / (M_PER_DEG * cos_lat) + step / 2
+    lat_range = range(math.ceil((lat - lat_span) / step), math.floor((lat + lat_span) / step) + 1)
+    lon_range = range(math.ceil((lon - lon_span) / step), math.floor((lon + lon_span) / step) + 1)
+    return {(i, j) for i in lat_range for j in lon_range}
+
+
+def invalidate_nearby_assessments(points: Iterable[Tuple[float, float]]) -> None:
+    """
+    Drop cached assessments that new reports at `points` could change, i.e.
+    every entry in a grid cell within REPORT_INFLUENCE_M of a report. Only
+    those cells are looked up, once each however many reports share them.
+    """
+    now = time.monotonic()
+    cells = set()
+    for lat, lon in points:
+        _REPORT_SEQ["last"] += 1
+        _REPORT_LOG.append((_REPORT_SEQ["last"], now, lat, lon))
+        cells |= cells_within(lat, lon, REPORT_INFLUENCE_M, LOCATION_BUCKET_DEG)
+    for cell in cells:
+        _LOCATION_CACHE.pop(cell, None)
+        # Later requests start a fresh query rather than join one that may
+        # have counted reports before this one landed
+        _IN_FLIGHT.pop(cell, None)
+    while _REPORT_LOG and now - _REPORT_LOG[0][1] > REPORT_LOG_RETAIN_S:
+        _REPORT_SEQ["pruned"] = _REPORT_LOG.popleft()[0]
+
+
+def invalidation_token() -> int:
+    """Sequence number of the latest invalidated report; read before querying."""
+    return _REPORT_SEQ["last"]
+
+
+def assessment_is_current(lat: float, lon: float, token: int) -> bool:
+    """
+    Whether an assessment of (lat, lon) that started at `token` may still be
+    cached, i.e. no report within REPORT_INFLUENCE_M has been invalidated
+    since. Assessments older than the retained log are treated as stale.
+    """
+    if token < _REPORT_SEQ["pruned"]:
+        return False
+    for seq, _ts, report_lat, report_lon in reversed(_REPORT_LOG):
+        if seq <= token:
+            break
+        if distance_m(lat, lon, report_lat, report_lon) <= REPORT_INFLUENCE_M:
+            return False
+    return True
+
+
+def _cached_weather(since: datetime) -> Tuple[bool, Any]:
+    """
+    (hit, doc) for the latest weather snapshot fetched after `since`.
+    A fresh entry queried with an equal or earlier bound answers any
+    later bound: its doc is the latest one, so it either qualifies or
+    nothing does.
+    """
+    cached_since = _WEATHER_CACHE["since"]
+    if (
+        time.monotonic() - _WEATHER_CACHE["ts"] >= WEATHER_CACHE_TTL_S
+        or cached_since is None
+        or cached_since > since
+    ):
+        return False, None
+    doc = _WEATHER_CACHE["doc"]
+    if doc is not None:
+        fetched_at = doc["fetched_at"]
+        # Motor returns naive UTC datetimes unless the client is tz_aware
+        if fetched_at.tzinfo is None:
+            fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+        if fetched_at < since:
+            return True, None
+    return True, doc
+
+
+def _threshold_result(user_reports_count: int, high_risk_reports: int) -> Dict[str, Any]:
+    """Turn the nearby report counts into a threshold risk assessment."""
+    details_output = {"user_reports_found": user_reports_count}
+    risk_level = "Low"
+
+    if high_risk_reports:
+        risk_level = "High"
+        details_output["trigger"] = "High water level reported by users"
+    elif user_reports_count > 0:
+        risk_level = "Medium"
+        details_output["trigger"] = f"{user_reports_count} recent user reports"
+    else:
+        details_output["trigger"] = "No recent user reports"
+
+    return {"risk": risk_level, "details": details_output}
+
+
+def _threshold_error(error: Exception) -> Dict[str, Any]:
+    """Threshold assessment returned when the report queries fail."""
     return {
-        "severity_from_text": severity,
-        "extracted_locations": list(set(entities)),
-        "actionable_words": list(set(actionable_words)),
+        "risk": "Unknown",
+        "details": {"error": str(error), "user_reports_found": 0},
+    }
+
+
+def _default_features(error: Exception) -> Dict[str, Any]:
+    """Feature payload used when the feature queries fail."""
+    return {
+        "features": np.array([25.0, 50, 0.0, 1013, 0, 0.0], dtype=np.float32),
+        "weather_data_found": False,
+        "error": str(error),
+    }
+
+
+def _weather_features(recent_weather, reports_in_vicinity: int) -> Dict[str, Any]:
+    """Build the ML feature vector from a weather snapshot and a report count."""
+    # Default features in case data is missing
+    temp = 25.0
+    humidity = 50
+    rain_1h_mm = 0.0
+    pressure = 1013
+    rainfall_next_3_hours = 0.0
+    weather_data_was_found = False
+
+    if recent_weather:
+        weather_data_was_found = True
+        current = recent_weather.get("current_weather", {})
+
+        temp = current.get("temp", temp)
+        humidity = current.get("humidity", humidity)
+        rain_1h_mm = current.get("rain_1h_mm", rain_1h_mm)
+        pressure = current.get("pressure", pressure)
+
+        # Pre-aggregated at ingest from the forecast
+        rainfall_next_3_hours = recent_weather.get(
+            "rainfall_next_3h", rainfall_next_3_hours
+        )
+
+    return {
+        # Built directly as the float32 row FloodPredictor consumes
+        "features": np.fromiter(
+            (
+                temp,
+                humidity,
+                rain_1h_mm,
+                pressure,
+                reports_in_vicinity,
+                rainfall_next_3_hours,
+            ),
+            dtype=np.float32,
+            count=N_FEATURES,
+        ),
+        "weather_data_found": weather_data_was_found,
     }
 
 
 class RiskAssessmentService:
     """Service for flood risk assessment and NLP-based report analysis."""
 
-    def __init__(self, database):
+    def __init__(
+        self,
+        database,
+        geo_index: bool = False,
+        bbox_index: bool = False,
+        predict_batcher=None,
+    ):
         """The database connection is now injected for better testability."""
         self.db = database
         self.thresholds = RISK_THRESHOLDS
+        self._geo_ok = geo_index
+        self._bbox_index_ok = bbox_index
+        # None when the ML predictor failed to load
+        self._predict_batcher = predict_batcher
+
+    def _area_filter(self, lat: float, lon: float) -> Dict[str, Any]:
+        """Filter for reports within ~1km of (lat, lon)."""
+        if self._geo_ok:
+            return {
+                "location": {
+                    "$geoWithin": {
+                        "$centerSphere": [[lon, lat], NEARBY_RADIUS_M / EARTH_RADIUS_M]
+                    }
+                }
+            }
+        return {
+            "latitude": {"$gte": lat - 0.01, "$lte": lat + 0.01},
+            "longitude": {"$gte": lon - 0.01, "$lte": lon + 0.01},
+        }
+
+    def _area_hint(self) -> Dict[str, Any]:
+        """
+        Index hint for queries using _area_filter. Bounding-box queries are
+        pinned to the (latitude, longitude, created_at) index so the planner
+        cannot settle for created_at alone; geo queries only have the 2dsphere
+        index to choose from and are left to the planner. No hint is given
+        unless the bbox index was confirmed at startup.
+        """
+        if self._geo_ok or not self._bbox_index_ok:
+            return {}
+        return {"hint": REPORTS_BBOX_INDEX}
 
     async def analyze_description_with_nlp(self, description: str) -> Dict[str, Any]:
         """
         Asynchronously analyzes a user's description without blocking the server.
         """
-        # Run the synchronous, CPU-bound function in a separate thread
-        loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(None, _run_spacy_analysis, description)
-        return result
+        # Queue for the next nlp.pipe batch, which runs on the NLP thread pool
+        return await _NLP_BATCHER.submit(description)
 
-    async def check_thresholds(self, lat: float, lon: float) -> Dict[str, Any]:
+    async def analyze_descriptions_with_nlp(
+        self, descriptions: List[str]
+    ) -> List[Dict[str, Any]]:
         """
-        Check if a location meets risk thresholds based on recent user reports.
-        Uses geospatial search when possible with a reasonable radius (~1km),
-        with a fallback to bounding-box search.
+        Analyze many descriptions in one executor hop using spaCy's batched pipe.
         """
-        try:
-            reports_collection = self.db.get_collection("reports")
-
-            # Define a time window for recent reports (e.g., last 24 hours)
-            time_window_start = datetime.now(timezone.utc) - timedelta(hours=24)
-
-            # Prefer geospatial $nearSphere if we have a 2dsphere index on 'location'
-            query = {"created_at": {"$gte": time_window_start}}
-
-            nearby_reports: List[dict] = []
-            try:
-                cursor = reports_collection.find(
-                    {
-                        **query,
-                        "location": {
-                            "$nearSphere": {
-                                "$geometry": {
-                                    "type": "Point",
-                                    "coordinates": [lon, lat],
-                                },
-                                "$maxDistance": 1000,  # ~1km
-                            }
-                        },
-                    }
-                )
-                nearby_reports = await cursor.limit(50).to_list(length=50)
-            except Exception as geo_err:
-                # Fallback to simple bounding-box if geospatial not available
-                print(f"ℹ️ Geospatial query failed, falling back to bbox: {geo_err}")
-                nearby_reports = (
-                    await reports_collection.find(
-                        {
-                            **query,
-                            "latitude": {"$gte": lat - 0.01, "$lte": lat + 0.01},
-                            "longitude": {"$gte": lon - 0.01, "$lte": lon + 0.01},
-                        }
-                    )
-                    .limit(50)
-                    .to_list(length=50)
-                )
-
-            user_reports_count = len(nearby_reports)
-            high_risk_reports = [
-                r
-                for r in nearby_reports
-                if r.get("water_level") in self.thresholds.get("HIGH_WATER_LEVEL", [])
-            ]
-
-            details_output = {"user_reports_found": user_reports_count}
-            risk_level = "Low"
-
-            if high_risk_reports:
-                risk_level = "High"
-                details_output["trigger"] = "High water level reported by users"
-            elif user_reports_count > 0:
-                risk_level = "Medium"
-                details_output["trigger"] = f"{user_reports_count} recent user reports"
-            else:
-                details_output["trigger"] = "No recent user reports"
-
-            return {"risk": risk_level, "details": details_output}
+        if not descriptions:
+            return []
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _NLP_EXECUTOR, _run_spacy_analysis_batch, descriptions
+        )
 
-        except Exception as e:
-            print(f"Error in check_thresholds: {e}")
-            return {
-                "risk": "Unknown",
-                "details": {"error": str(e), "user_reports_found": 0},
-            }
+    async def _latest_weather(self, since: datetime):
+        """
+        Most recent weather snapshot fetched after `since` (or None).
+        Snapshots only change when the cron runs, so the result is reused
+        for WEATHER_CACHE_TTL_S seconds across requests, and concurrent
+        misses wait for a single refresh query.
+        """
+        hit, doc = _cached_weather(since)
+        if hit:
+            return doc
+        async with _WEATHER_LOCK:
+            # Another request may have refreshed it while we waited
+            hit, doc = _cached_weather(since)
+            if hit:
+                return doc
+            now = time.monotonic()
+            doc = await self.db.get_collection("weather_data").find_one(
+                {"fetched_at": {"$gte": since}},
+                projection=WEATHER_FEATURE_PROJECTION,
+                sort=[("fetched_at", -1)],
+            )
+            _WEATHER_CACHE.update(doc=doc, ts=now, since=since)
+            return doc
 
-    async def gather_features_for_prediction(
-        self, lat: float, lon: float
-    ) -> Dict[str, Any]:  # Changed return type to Dict for clarity
-        """Gather enhanced features for the ML model."""
+    async def assess_risk(self, lat: float, lon: float) -> RiskResponse:
+        """
+        Hybrid risk assessment for (lat, lon), answered from the response
+        computed in the last LOCATION_CACHE_TTL_S seconds for the same grid
+        bucket. Concurrent misses for a bucket share one assessment; other
+        buckets run in parallel. Callers must treat the response as read-only.
+        """
+        key = grid_key(lat, lon, LOCATION_BUCKET_DEG)
+        cached = _LOCATION_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+        task = _IN_FLIGHT.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._assess_and_cache(key, lat, lon))
+            _IN_FLIGHT[key] = task
+        # Shielded so one caller giving up doesn't cancel the others' query
+        return await asyncio.shield(task)
+
+    async def _assess_and_cache(
+        self, key: Tuple[int, int], lat: float, lon: float
+    ) -> RiskResponse:
+        """Run one assessment for a bucket and cache it if it is usable."""
+        token = invalidation_token()
         try:
-            reports_collection = self.db.get_collection("reports")
-            weather_collection = self.db.get_collection("weather_data")
-
-            # Define a recent time window for weather data and user reports for ML
-            time_window_start_ml = datetime.now(timezone.utc) - timedelta(
-                hours=3
-            )  # More recent for ML
-
-            reports_in_vicinity = await reports_collection.count_documents(
-                {
-                    "latitude": {"$gte": lat - 0.01, "$lte": lat + 0.01},
-                    "longitude": {"$gte": lon - 0.01, "$lte": lon + 0.01},
-                    "created_at": {"$gte": time_window_start_ml},
-                }
+            threshold_result, features_data = await self._assess_location_uncached(
+                lat, lon
             )
-
-            # Fetch the most recent weather data, within a reasonable time frame
-            recent_weather = await weather_collection.find_one(
-                {"fetched_at": {"$gte": time_window_start_ml}},
-                sort=[("fetched_at", -1)],
+            response = await self._build_response(threshold_result, features_data)
+        finally:
+            if _IN_FLIGHT.get(key) is asyncio.current_task():
+                del _IN_FLIGHT[key]
+        # Failed or degraded assessments (including fallback features) are
+        # not cached so the next request retries, and neither are ones that
+        # a report may have made stale meanwhile
+        if (
+            response.details.error is None
+            and "error" not in features_data
+            and assessment_is_current(lat, lon, token)
+        ):
+            _LOCATION_CACHE[key] = response
+        return response
+
+    async def _build_response(
+        self, threshold_result: Dict[str, Any], features_data: Dict[str, Any]
+    ) -> RiskResponse:
+        """Combine the threshold check and the ML prediction into a RiskResponse."""
+        ml_risk_level = RiskLevel.UNKNOWN
+        if self._predict_batcher:
+            raw_prediction = await self._predict_batcher.submit(
+                features_data["features"]
             )
+            ml_risk_level = ML_RISK_LEVELS.get(raw_prediction, RiskLevel.UNKNOWN)
+
+        threshold_risk_level = RiskLevel(threshold_result["risk"])
+        # The more severe of the two assessments wins; anything else is Low
+        final_risk = FINAL_RISK_BY_RANK[
+            max(
+                RISK_RANK.get(threshold_risk_level, 0),
+                RISK_RANK.get(ml_risk_level, 0),
+            )
+        ]
 
-            # Default features in case data is missing
-            temp = 25.0
-            humidity = 50
-            rain_1h_mm = 0.0
-            pressure = 1013
-            rainfall_next_3_hours = 0.0
-            weather_data_was_found = False
-
-            if recent_weather:
-                weather_data_was_found = True
-                current = recent_weather.get("current_weather", {})
-                forecast = recent_weather.get("forecast_data", [])
-
-                temp = current.get("temp", temp)
-                humidity = current.get("humidity", humidity)
-                rain_1h_mm = current.get("rain_1h_mm", rain_1h_mm)
-                pressure = current.get("pressure", pressure)
-
-                # Sum rainfall for the next 3 hours from forecast
-                # Assuming forecast_data has elements with 'dt_txt' and 'rain.3h'
-                now = datetime.now(timezone.utc)
-                for item in forecast:
-                    # Parse dt_txt to datetime object if it's a string
-                    if "dt_txt" in item:
-                        forecast_time_str = item["dt_txt"]
-                        # Example format: "2023-10-28 12:00:00"
-                        forecast_time = datetime.strptime(
-                            forecast_time_str, "%Y-%m-%d %H:%M:%S"
-                        ).replace(tzinfo=timezone.utc)
-
-                        if now <= forecast_time <= (now + timedelta(hours=3)):
-                            rainfall_next_3_hours += item.get("rain", {}).get("3h", 0)
+        contributing_factors = []
+        if "trigger" in threshold_result["details"]:
+            contributing_factors.append(threshold_result["details"]["trigger"])
 
-            return {
-                "features": [
-                    temp,
-                    humidity,
-                    rain_1h_mm,
-                    pressure,
-                    reports_in_vicinity,
-                    rainfall_next_3_hours,
-                ],
-                "weather_data_found": weather_data_was_found,
-            }
+        if self._predict_batcher and ml_risk_level != RiskLevel.UNKNOWN:
+            contributing_factors.append(f"ML assessment: {ml_risk_level.value}")
+        elif features_data["weather_data_found"] and not self._predict_batcher:
+            contributing_factors.append(
+                "Recent weather data available (ML model disabled)"
+            )
+
+        if not contributing_factors:
+            contributing_factors.append("No specific factors identified.")
+
+        return RiskResponse(
+            risk_level=final_risk,
+            source=AssessmentSource.HYBRID_HISTORICAL,
+            details=RiskAssessmentDetails(
+                threshold_assessment=threshold_risk_level,
+                ml_assessment=ml_risk_level,
+                user_reports_found=threshold_result["details"].get(
+                    "user_reports_found", 0
+                ),
+                weather_data_found=features_data["weather_data_found"],
+                contributing_factors=contributing_factors,
+                recommendation=RECOMMENDATIONS[final_risk],
+                error=threshold_result["details"].get("error"),
+            ),
+        )
+
+    async def _assess_location_uncached(
+        self, lat: float, lon: float
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Threshold check and ML features in one pass: a single $facet
+        aggregation over the 24h nearby reports computes all three report
+        counts, while the weather lookup runs concurrently.
+        Returns (threshold_result, features_data).
+        """
+        now = datetime.now(timezone.utc)
+        time_window_start = now - RECENT_REPORT_WINDOW
+        time_window_start_ml = now - RECENT_WEATHER_WINDOW
+
+        pipeline = [
+            {
+                "$match": {
+                    "created_at": {"$gte": time_window_start},
+                    **self._area_filter(lat, lon),
+                }
+            },
+            {
+                "$facet": {
+                    "recent": [{"$limit": 50}, {"$count": "n"}],
+                    "high": [
+                        {"$match": {"water_level": {"$in": HIGH_WATER_LEVELS_LIST}}},
+                        {"$limit": 1},
+                        {"$count": "n"},
+                    ],
+                    "ml_window": [
+                        {"$match": {"created_at": {"$gte": time_window_start_ml}}},
+                        {"$count": "n"},
+                    ],
+                }
+            },
+        ]
 
+        async def _report_counts() -> Dict[str, int]:
+            cursor = self.db.get_collection("reports").aggregate(
+                pipeline, **self._area_hint()
+            )
+            facets = (await cursor.to_list(length=1))[0]
+            # $count emits nothing for an empty input, hence the default
+            return {name: (rows[0]["n"] if rows else 0) for name, rows in facets.items()}
+
+        counts, recent_weather = await asyncio.gather(
+            _report_counts(),
+            self._latest_weather(time_window_start_ml),
+            return_exceptions=True,
+        )
+
+        if isinstance(counts, Exception):
+            print(f"Error counting nearby reports: {counts}")
+            return _threshold_error(counts), _default_features(counts)
+        threshold_result = _threshold_result(counts["recent"], counts["high"])
+
+        if isinstance(recent_weather, Exception):
+            print(f"Error gathering features: {recent_weather}")
+            return threshold_result, _default_features(recent_weather)
+        try:
+            features_data = _weather_features(recent_weather, counts["ml_window"])
         except Exception as e:
             print(f"Error gathering features: {e}")
-            return {
-                "features": [25.0, 50, 0.0, 1013, 0, 0.0],
-                "weather_data_found": False,
-            }
+            features_data = _default_features(e)
+        return threshold_result, features_data
@@ -2,10 +2,11 @@
 Weather data fetching service
 """
 
+import asyncio
 import os
-import requests
+import httpx
 import pymongo
-from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+from pymongo.errors import BulkWriteError, ConnectionFailure, ServerSelectionTimeoutError
 from dotenv import load_dotenv
 from datetime import datetime, timezone
 import json
@@ -13,6 +14,10 @@ import time
 
 from config.settings import MONGO_URI, OPENWEATHER_API_KEY, TARGET_CITIES
 
+# Retry policy for OpenWeather requests
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+
 
 # --- Database Connection with Fallback ---
 def connect_to_mongodb():
@@ -136,80 +141,143 @@ except Exception as e:
 
 
 # --- Fetch and Store Weather Data ---
+def sum_forecast_rain(forecast_list, start_ts, hours):
+    """Total forecast rain.3h (mm) for slots starting within `hours` of start_ts."""
+    end_ts = start_ts + hours * 3600
+    return sum(
+        item.get("rain", {}).get("3h", 0)
+        for item in forecast_list
+        if start_ts <= item.get("dt", 0) <= end_ts
+    )
+
+
+async def get_with_retry(client, url):
+    """GET url, retrying transient 5xx responses with exponential backoff."""
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        response = await client.get(url)
+        if response.status_code < 500 or attempt == HTTP_MAX_RETRIES:
+            return response
+        await asyncio.sleep(HTTP_BACKOFF_FACTOR * 2**attempt)
+
+
+async def fetch_city_weather(client, city):
+    """
+    Fetch current weather and forecast for one city (both requests in flight
+    at once) and build its weather document.
+    """
+    print(f"🌤️  Fetching weather data for {city['name']}...")
+
+    # --- 1 & 2. Get CURRENT and FORECAST data (Standard Free API) ---
+    current_weather_url = f"https://api.openweathermap.org/data/2.5/weather?lat={city['lat']}&lon={city['lon']}&appid={OPENWEATHER_API_KEY}&units=metric"
+    forecast_url = f"https://api.openweathermap.org/data/2.5/forecast?lat={city['lat']}&lon={city['lon']}&appid={OPENWEATHER_API_KEY}&units=metric"
+    current_response, forecast_response = await asyncio.gather(
+        get_with_retry(client, current_weather_url),
+        get_with_retry(client, forecast_url),
+    )
+    current_response.raise_for_status()
+    forecast_response.raise_for_status()
+    current_data = current_response.json()
+    forecast_data = forecast_response.json()
+
+    # --- 3. Combine and structure the document ---
+    fetched_at = datetime.now(timezone.utc)
+    fetched_ts = fetched_at.timestamp()
+    return {
+        "city_name": city["name"],
+        "coordinates": {
+            "type": "Point",
+            "coordinates": [city["lon"], city["lat"]],
+        },
+        "current_weather": {
+            "temp": current_data["main"]["temp"],
+            "humidity": current_data["main"]["humidity"],
+            "weather_condition": current_data["weather"][0]["description"],
+            "rain_1h_mm": current_data.get("rain", {}).get("1h", 0),
+            "pressure": current_data["main"]["pressure"],
+            "wind_speed": current_data.get("wind", {}).get("speed", 0),
+        },
+        "forecast_data": forecast_data["list"],  # This is a list of 3-hour forecasts
+        # Store as datetime, not string, for proper sorting and TTL/indexes
+        "fetched_at": fetched_at,
+        # Pre-aggregated so the API never walks the forecast list
+        "rainfall_next_3h": sum_forecast_rain(forecast_data["list"], fetched_ts, 3),
+        "rainfall_next_6h": sum_forecast_rain(forecast_data["list"], fetched_ts, 6),
+        "rainfall_next_12h": sum_forecast_rain(forecast_data["list"], fetched_ts, 12),
+    }
+
+
+async def fetch_all_weather():
+    """
+    Fetch every target city concurrently over one HTTP/2 client.
+    Returns the weather documents for the cities that succeeded.
+    """
+    # One keep-alive pool for the whole run; the transport also retries
+    # failed connection attempts
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=HTTP_MAX_RETRIES,
+        limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+    )
+    async with httpx.AsyncClient(timeout=10, transport=transport) as client:
+        results = await asyncio.gather(
+            *(fetch_city_weather(client, city) for city in TARGET_CITIES),
+            return_exceptions=True,
+        )
+
+    weather_documents = []
+    for city, result in zip(TARGET_CITIES, results):
+        if isinstance(result, httpx.HTTPError):
+            print(f"⚠️  Error fetching data for {city['name']}: {result}")
+            if "401" in str(result):
+                print(
+                    "💡 This appears to be an API key issue. Please check your OpenWeather API key."
+                )
+        elif isinstance(result, Exception):
+            print(f"❌ An error occurred for {city['name']}: {result}")
+        else:
+            weather_documents.append(result)
+    return weather_documents
+
+
 def fetch_and_store_weather():
     """
     Fetches current weather and 5-day forecast for target cities and stores it in MongoDB or JSON file.
     """
-    all_weather_data = []
-
     print(f"🌤️  Fetching weather data for {len(TARGET_CITIES)} cities...")
     print("=" * 60)
 
-    for city in TARGET_CITIES:
+    all_weather_data = asyncio.run(fetch_all_weather())
+
+    if all_weather_data and db_connected and weather_collection is not None:
         try:
-            print(f"🌤️  Fetching weather data for {city['name']}...")
-
-            # --- 1. Get CURRENT weather data (Standard Free API) ---
-            current_weather_url = f"https://api.openweathermap.org/data/2.5/weather?lat={city['lat']}&lon={city['lon']}&appid={OPENWEATHER_API_KEY}&units=metric"
-            current_response = requests.get(current_weather_url, timeout=10)
-            current_response.raise_for_status()
-            current_data = current_response.json()
-
-            # --- 2. Get FORECAST data (Standard Free API) ---
-            forecast_url = f"https://api.openweathermap.org/data/2.5/forecast?lat={city['lat']}&lon={city['lon']}&appid={OPENWEATHER_API_KEY}&units=metric"
-            forecast_response = requests.get(forecast_url, timeout=10)
-            forecast_response.raise_for_status()
-            forecast_data = forecast_response.json()
-
-            # --- 3. Combine and structure the document ---
-            weather_document = {
-                "city_name": city["name"],
-                "coordinates": {
-                    "type": "Point",
-                    "coordinates": [city["lon"], city["lat"]],
-                },
-                "current_weather": {
-                    "temp": current_data["main"]["temp"],
-                    "humidity": current_data["main"]["humidity"],
-                    "weather_condition": current_data["weather"][0]["description"],
-                    "rain_1h_mm": current_data.get("rain", {}).get("1h", 0),
-                    "pressure": current_data["main"]["pressure"],
-                    "wind_speed": current_data.get("wind", {}).get("speed", 0),
-                },
-                "forecast_data": forecast_data["list"],  # This is a list of 3-hour forecasts
-                # Store as datetime, not string, for proper sorting and TTL/indexes
-                "fetched_at": datetime.now(timezone.utc),
-            }
-
-            # Try to store in MongoDB if connected
-            if db_connected and weather_collection is not None:
-                try:
-                    weather_collection.insert_one(weather_document)
-                    print(
-                        f"✅ Successfully fetched and stored weather data for {city['name']} in MongoDB."
-                    )
-                    # Add to summary data for display
-                    all_weather_data.append(weather_document)
-                except Exception as db_error:
-                    print(f"⚠️  MongoDB storage failed for {city['name']}: {db_error}")
-                    print(f"📁 Adding {city['name']} data to JSON fallback...")
-                    all_weather_data.append(weather_document)
+            # One round-trip for every city; unordered so a bad document
+            # does not stop the rest from being written
+            weather_collection.insert_many(all_weather_data, ordered=False)
+            print(
+                f"✅ Successfully stored weather data for {len(all_weather_data)} cities in MongoDB."
+            )
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            if write_errors:
+                # The other cities were written; keep the failed ones on disk
+                failed_docs = [all_weather_data[err["index"]] for err in write_errors]
+                failed = ", ".join(sorted(doc["city_name"] for doc in failed_docs))
+                print(f"⚠️  MongoDB storage failed for {failed}: {e}")
+                print("📁 Saving the failed cities to JSON fallback...")
+                save_to_json_file(failed_docs)
             else:
-                # Add to JSON fallback
-                all_weather_data.append(weather_document)
-                print(f"✅ Successfully fetched weather data for {city['name']} (JSON fallback).")
-
-        except requests.exceptions.RequestException as e:
-            print(f"⚠️  Error fetching data for {city['name']}: {e}")
-            if "401" in str(e):
-                print(
-                    "💡 This appears to be an API key issue. Please check your OpenWeather API key."
-                )
-        except Exception as e:
-            print(f"❌ An error occurred for {city['name']}: {e}")
-
-    # Save to JSON file if we have data and MongoDB is not connected
-    if all_weather_data and not db_connected:
+                # Only the write concern failed: the documents were written
+                # but not confirmed as durable, so keep a copy on disk too
+                print(f"⚠️  MongoDB write concern not satisfied: {e}")
+                print("📁 Saving weather data to JSON fallback...")
+                save_to_json_file(all_weather_data)
+        except Exception as db_error:
+            print(f"⚠️  MongoDB storage failed: {db_error}")
+            print("📁 Saving weather data to JSON fallback...")
+            save_to_json_file(all_weather_data)
+    elif all_weather_data:
+        # Save to JSON file since MongoDB is not connected
+        print(f"✅ Successfully fetched weather data for {len(all_weather_data)} cities (JSON fallback).")
         save_to_json_file(all_weather_data)
 
     # Display summary
@@ -223,7 +291,7 @@ def save_to_json_file(weather_data):
         filename = f"weather_data_{timestamp}.json"
 
         with open(filename, "w", encoding="utf-8") as f:
-            json.dump(weather_data, f, indent=2, ensure_ascii=False)
+            json.dump(weather_data, f, indent=2, ensure_ascii=False, default=str)
 
         print(f"\n💾 Weather data saved to: {filename}")
         print(f"📊 Total cities processed: {len(weather_data)}")
@@ -251,7 +319,8 @@ def display_weather_summary(weather_data):
         print("💡 Check your OpenWeather API key and internet connection.")
 
 
-if __name__ == "__main__":
+def main():
+    """Command-line entry point: check the API key, then fetch and store."""
     print("🌤️  RAINSAFE WEATHER DATA FETCHER")
     print("=" * 50)
     print("💡 This script fetches weather data for major Indian cities")
@@ -299,3 +368,7 @@ if __name__ == "__main__":
                     print("🔒 MongoDB connection closed.")
                 except:
                     pass
+
+
+if __name__ == "__main__":
+    main()
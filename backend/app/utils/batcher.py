@@ -0,0 +1,138 @@
+"""
+Asyncio micro-batcher: coalesce concurrent single-item calls into batches
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional, Set
+
+
+class MicroBatcher:
+    """
+    Collect items submitted by concurrent requests and hand them to a
+    synchronous batch function in one executor call. A batch is flushed
+    once max_batch items are queued or max_delay_ms has passed since the
+    first one arrived, whichever comes first. Up to max_concurrency
+    batches run at once; match it to the executor's worker count (the
+    default mirrors ThreadPoolExecutor's own default).
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch: int = 32,
+        max_delay_ms: float = 10,
+        executor: Optional[Executor] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        self._process_batch = process_batch
+        self._max_batch = max_batch
+        self._max_delay = max_delay_ms / 1000
+        self._executor = executor
+        self._max_concurrency = max_concurrency or min(32, (os.cpu_count() or 1) + 4)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result from the next batch."""
+        if self._worker is None or self._worker.done():
+            # Created lazily so the queue and task belong to the running loop
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self._max_concurrency)
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stop the background worker; pending callers are cancelled."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        for task in list(self._in_flight):
+            task.cancel()
+        await asyncio.gather(*self._in_flight, return_exceptions=True)
+        if self._queue is not None:
+            while not self._queue.empty():
+                _item, future = self._queue.get_nowait()
+                future.cancel()
+            self._queue = None
+
+    async def _collect(self) -> list:
+        """Wait for one item, then gather more until the batch is full or stale."""
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            batch.append(await self._queue.get())
+            deadline = loop.time() + self._max_delay
+            while len(batch) < self._max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            # Items already taken off the queue are no longer drained by
+            # close(), so cancel their callers here
+            for _item, future in batch:
+                future.cancel()
+            raise
+        return batch
+
+    async def _run(self) -> None:
+        """
+        Background loop: collect batches and dispatch each as its own task,
+        so a slow batch doesn't hold back the next one. Waiting for a free
+        slot first lets items pile up into larger batches when saturated.
+        """
+        while True:
+            await self._slots.acquire()
+            try:
+                batch = await self._collect()
+            except BaseException:
+                self._slots.release()
+                raise
+            task = asyncio.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch: list) -> None:
+        """Run one batch in the executor and distribute results to futures."""
+        loop = asyncio.get_running_loop()
+        items = [item for item, _future in batch]
+        try:
+            results = list(
+                await loop.run_in_executor(self._executor, self._process_batch, items)
+            )
+        except asyncio.CancelledError:
+            # Cancelled on close: don't leave the callers waiting forever
+            for _item, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            for _item, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._slots.release()
+        for (_item, future), result in zip(batch, results):
+            # Callers that gave up (e.g. client disconnect) are skipped
+            if not future.done():
+                future.set_result(result)
+        if len(results) != len(batch):
+            error = RuntimeError(
+                f"batch function returned {len(results)} results for {len(batch)} items"
+            )
+            for _item, future in batch[len(results):]:
+                if not future.done():
+                    future.set_exception(error)
@@ -2,11 +2,21 @@
 Database connection and utilities
 """
 
+import asyncio
 import os
 import motor.motor_asyncio
 
 # Assuming config.settings has MONGO_URI and DATABASE_NAME
-from config.settings import MONGO_URI, DATABASE_NAME
+from config.settings import (
+    DATABASE_NAME,
+    MONGO_MAX_POOL_SIZE,
+    MONGO_MIN_POOL_SIZE,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_URI,
+)
+
+# Backs the bounding-box "nearby reports in a time window" filter
+REPORTS_BBOX_INDEX = [("latitude", 1), ("longitude", 1), ("created_at", -1)]
 
 
 class Database:
@@ -19,12 +29,20 @@ class Database:
     async def connect(self):
         """Connect to MongoDB"""
         try:
-            self.client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI)
+            self.client = motor.motor_asyncio.AsyncIOMotorClient(
+                MONGO_URI,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            )
             self.database = self.client[DATABASE_NAME]
 
             # Test connection
             await self.client.admin.command("ping")
             print("✅ Successfully connected to MongoDB")
+
+            await self.ensure_indexes()
+            await self.warm_pool()
             return True
 
         except Exception as e:
@@ -33,6 +51,33 @@ class Database:
             self.database = None  # Ensure database is reset on failure
             return False
 
+    async def ensure_indexes(self):
+        """
+        Create the indexes behind the hot API queries (no-op if present).
+        The geo index on reports is handled by the risk service.
+        """
+        try:
+            await self.database.reports.create_index(REPORTS_BBOX_INDEX)
+            # Latest weather snapshot lookup
+            await self.database.weather_data.create_index([("fetched_at", -1)])
+        except Exception as e:
+            print(f"⚠️ Could not create indexes: {e}")
+
+    async def warm_pool(self):
+        """
+        Open the minimum pool connections now (TLS handshake + auth) so the
+        first requests after startup don't pay for them.
+        """
+        try:
+            await asyncio.gather(
+                *(
+                    self.client.admin.command("ping")
+                    for _ in range(MONGO_MIN_POOL_SIZE)
+                )
+            )
+        except Exception as e:
+            print(f"⚠️ Could not warm connection pool: {e}")
+
     async def disconnect(self):
         """Disconnect from MongoDB"""
         if self.client:  # This is fine as client is an actual object that can be checked
@@ -13,9 +13,26 @@ API_TITLE = "RainSafe API"
 API_VERSION = "1.0.0"
 API_DESCRIPTION = "Flood risk assessment and weather monitoring API"
 
+# CORS Configuration
+# Comma-separated browser origins allowed to call the API
+# (default: the Vite dev server)
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:5173").split(",")
+    if origin.strip()
+]
+
 # Database Configuration
 MONGO_URI = os.getenv("MONGO_URI")
 DATABASE_NAME = "rainsafe_db"
+# Connection pool bounds; the minimum is opened at startup
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", 5))
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 50))
+# How long to wait for a reachable server; SRV lookups on a cold start
+# against Atlas can take a few seconds
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(
+    os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000)
+)
 
 # External API Configuration
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
@@ -34,6 +51,18 @@ TARGET_CITIES = [
 MODEL_PATH = "data/ml_artifacts/model.pkl"
 SCALER_PATH = "data/ml_artifacts/scaler.pkl"
 FEATURES_PATH = "data/ml_artifacts/model_features.pkl"
+# Optional ONNX export of the model (see scripts/export_onnx_model.py)
+ONNX_MODEL_PATH = "data/ml_artifacts/model.int8.onnx"
+
+# Report Ingestion Configuration
+# Upper bound on reports accepted by one /reports/batch request
+MAX_REPORT_BATCH_SIZE = int(os.getenv("MAX_REPORT_BATCH_SIZE", 100))
+
+# NLP Configuration
+# Threads dedicated to spaCy analysis (default: one per core, at most 8)
+SPACY_THREAD_POOL_SIZE = int(
+    os.getenv("SPACY_THREAD_POOL_SIZE", min(8, os.cpu_count() or 1))
+)
 
 # Risk Assessment Configuration
 RISK_THRESHOLDS = {
@@ -2,56 +2,94 @@
 RainSafe Backend - Main Application (with Dependency Injection)
 """
 
+import logging
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from typing import List
 
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from pymongo.errors import BulkWriteError
 
-from app.models.flood_predictor import FloodPredictor
+from app.models.flood_predictor import get_predictor
 from app.models.schemas import (
-    AssessmentSource,
     Report,
+    ReportBatchCreate,
+    ReportBatchResponse,
     ReportCreate,
     ReportResponse,
-    RiskAssessmentDetails,
-    RiskLevel,
     RiskResponse,
 )
-from app.services.risk_service import RiskAssessmentService
+from app.services.predict_batcher import PredictBatcher
+from app.services.risk_service import (
+    RiskAssessmentService,
+    analysis_cache_info,
+    close_nlp_batcher,
+    detect_bbox_index,
+    ensure_report_indexes,
+    invalidate_nearby_assessments,
+)
 from app.utils.database import db
+from config.settings import CORS_ORIGINS, LOG_LEVEL
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger("rainsafe")
+
 
-def get_risk_service() -> RiskAssessmentService:
-    """Dependency provider for the RiskAssessmentService."""
-    return RiskAssessmentService(database=db)
+def get_risk_service(request: Request) -> RiskAssessmentService:
+    """Dependency provider for the shared RiskAssessmentService."""
+    return request.app.state.risk_service
 
 
 @asynccontextmanager
 async def lifespan(fapi_app: FastAPI):
     """Manage application lifespan for startup and shutdown events."""
-    print("🚀 Starting RainSafe API...")
+    logging.basicConfig(
+        level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    logger.info("🚀 Starting RainSafe API...")
 
     if not await db.connect():
         raise RuntimeError("Failed to connect to MongoDB during startup.")
 
+    # Decide geo vs bounding-box report queries once, not per request
+    geo_index = await ensure_report_indexes(db)
+    bbox_index = await detect_bbox_index(db)
+    # Resolve collection handles once; handlers read them from app.state
+    fapi_app.state.reports = db.get_collection("reports")
+
     try:
-        fapi_app.state.predictor = FloodPredictor()
-        print("✅ Flood predictor (ML) model loaded successfully.")
+        fapi_app.state.predictor = get_predictor()
+        # Concurrent /risk requests share predict() calls
+        fapi_app.state.predict_batcher = PredictBatcher(fapi_app.state.predictor)
+        logger.info("✅ Flood predictor (ML) model loaded successfully.")
     except Exception as exc:  # pylint: disable=broad-exception-caught
-        print(
-            f"⚠️ ML predictor initialization failed: {exc}. "
-            "Running without ML predictions."
+        logger.warning(
+            "⚠️ ML predictor initialization failed: %s. "
+            "Running without ML predictions.",
+            exc,
         )
         fapi_app.state.predictor = None
+        fapi_app.state.predict_batcher = None
+
+    # One stateless service instance is shared by every request
+    fapi_app.state.risk_service = RiskAssessmentService(
+        database=db,
+        geo_index=geo_index,
+        bbox_index=bbox_index,
+        predict_batcher=fapi_app.state.predict_batcher,
+    )
 
     yield
 
-    print("🛑 Shutting down RainSafe API...")
+    logger.info("🛑 Shutting down RainSafe API...")
+    await close_nlp_batcher()
+    if fapi_app.state.predict_batcher:
+        await fapi_app.state.predict_batcher.close()
     await db.disconnect()
 
 
@@ -60,14 +98,17 @@ app = FastAPI(
     version="1.2.0",
     description="A scalable and testable API for flood risk assessment.",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    # Let browsers reuse preflight results for 10 minutes
+    max_age=600,
 )
 
 
@@ -77,38 +118,55 @@ def read_root():
     return {"status": "RainSafe API is running!"}
 
 
-@app.post("/report", response_model=ReportResponse, status_code=201)
+@app.get("/health/nlp")
+def nlp_cache_stats():
+    """Hit/miss counters and size of this worker's NLP analysis cache."""
+    return analysis_cache_info()
+
+
+def build_report_document(
+    report: ReportCreate, created_at: datetime, nlp_analysis: dict
+) -> dict:
+    """Build the MongoDB document stored for a submitted report."""
+    report_data = report.model_dump()
+    report_data["created_at"] = created_at
+    # GeoJSON point (lon, lat order) for the 2dsphere index
+    report_data["location"] = {
+        "type": "Point",
+        "coordinates": [report.longitude, report.latitude],
+    }
+    report_data["nlp_analysis"] = nlp_analysis
+    return report_data
+
+
+@app.post(
+    "/report",
+    response_model=ReportResponse,
+    status_code=201,
+)
 async def create_report(
     report: ReportCreate,
+    request: Request,
     risk_service: RiskAssessmentService = Depends(get_risk_service),
 ):
     """Submit a new flood report with non-blocking NLP analysis."""
     try:
-        report_data = report.model_dump()
-        report_data["created_at"] = datetime.now(timezone.utc)
-
         nlp_analysis = await risk_service.analyze_description_with_nlp(
             report.description
         )
-        report_data["nlp_analysis"] = nlp_analysis
-
-        reports_collection = db.get_collection("reports")
-        new_report_result = await reports_collection.insert_one(report_data)
-
-        created_report_doc = await reports_collection.find_one(
-            {"_id": new_report_result.inserted_id}
+        report_data = build_report_document(
+            report, datetime.now(timezone.utc), nlp_analysis
         )
-        if not created_report_doc:
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to retrieve newly created report.",
-            )
 
-        created_report_doc["_id"] = str(created_report_doc["_id"])
+        new_report_result = await request.app.state.reports.insert_one(report_data)
+
+        # Echo the document we already hold instead of reading it back
+        report_data["_id"] = str(new_report_result.inserted_id)
+        invalidate_nearby_assessments([(report.latitude, report.longitude)])
 
         return ReportResponse(
             message="Report received and analyzed successfully!",
-            data=Report(**created_report_doc),
+            data=Report(**report_data),
         )
 
     except Exception as exc:  # pylint: disable=broad-exception-caught
@@ -117,89 +175,90 @@ async def create_report(
         ) from exc
 
 
-@app.get("/risk", response_model=RiskResponse)
-async def get_risk(
-    lat: float,
-    lon: float,
+@app.post(
+    "/reports/batch",
+    response_model=ReportBatchResponse,
+    status_code=201,
+)
+async def create_reports_batch(
+    batch: ReportBatchCreate,
     request: Request,
+    response: Response,
     risk_service: RiskAssessmentService = Depends(get_risk_service),
 ):
-    """Get a user-friendly, hybrid flood risk assessment for a location."""
+    """
+    Submit many flood reports at once: the descriptions are analyzed in one
+    NLP batch and the reports are written with a single insert_many.
+    If only some reports are saved the response is a 207 listing the
+    failed positions, so clients resend just those.
+    """
     try:
-        threshold_result = await risk_service.check_thresholds(lat, lon)
-        ml_features_data = await risk_service.gather_features_for_prediction(lat, lon)
-
-        ml_risk_level = RiskLevel.UNKNOWN
-        if request.app.state.predictor:
-            raw_prediction = request.app.state.predictor.predict(
-                [ml_features_data["features"]]
-            )[0]
-            if raw_prediction == "High":
-                ml_risk_level = RiskLevel.HIGH
-            elif raw_prediction == "Low":
-                ml_risk_level = RiskLevel.LOW
-            else:
-                ml_risk_level = RiskLevel.UNKNOWN
-        else:
-            print(
-                "INFO: ML predictor is disabled or failed to load. "
-                "ml_assessment will be 'Unknown'."
+        nlp_analyses = await risk_service.analyze_descriptions_with_nlp(
+            [report.description for report in batch.reports]
+        )
+        created_at = datetime.now(timezone.utc)
+        report_docs = [
+            build_report_document(report, created_at, nlp_analysis)
+            for report, nlp_analysis in zip(batch.reports, nlp_analyses)
+        ]
+
+        failed_indices: List[int] = []
+        try:
+            # insert_many assigns each document its _id before writing
+            await request.app.state.reports.insert_many(report_docs, ordered=False)
+        except BulkWriteError as bwe:
+            # With ordered=False every other document was still written
+            failed_indices = sorted(
+                {err["index"] for err in bwe.details.get("writeErrors", [])}
             )
-
-        final_risk = RiskLevel.LOW
-        if (
-            threshold_result["risk"] == RiskLevel.HIGH.value
-            or ml_risk_level == RiskLevel.HIGH
-        ):
-            final_risk = RiskLevel.HIGH
-        elif (
-            threshold_result["risk"] == RiskLevel.MEDIUM.value
-            or ml_risk_level == RiskLevel.MEDIUM
-        ):
-            final_risk = RiskLevel.MEDIUM
-        else:
-            final_risk = RiskLevel.LOW
-
-        recommendations = {
-            RiskLevel.LOW: ("Conditions appear safe. Remain aware of weather changes."),
-            RiskLevel.MEDIUM: ("Potential for localized flooding. Exercise caution."),
-            RiskLevel.HIGH: ("High flood risk detected. Avoid travel in this area."),
-            RiskLevel.UNKNOWN: (
-                "Could not determine risk. Please check conditions manually."
-            ),
-        }
-
-        contributing_factors = []
-        if "trigger" in threshold_result["details"]:
-            contributing_factors.append(threshold_result["details"]["trigger"])
-
-        if request.app.state.predictor and ml_risk_level != RiskLevel.UNKNOWN:
-            contributing_factors.append(f"ML assessment: {ml_risk_level.value}")
-        elif ml_features_data["weather_data_found"] and not request.app.state.predictor:
-            contributing_factors.append(
-                "Recent weather data available (ML model disabled)"
+            if len(failed_indices) == len(report_docs):
+                raise
+            logger.warning(
+                "⚠️ Batch insert partially failed at indices %s", failed_indices
             )
 
-        if not contributing_factors:
-            contributing_factors.append("No specific factors identified.")
-
-        return RiskResponse(
-            risk_level=final_risk,
-            source=AssessmentSource.HYBRID_HISTORICAL,
-            details=RiskAssessmentDetails(
-                threshold_assessment=RiskLevel(threshold_result["risk"]),
-                ml_assessment=ml_risk_level,
-                user_reports_found=threshold_result["details"].get(
-                    "user_reports_found", 0
-                ),
-                weather_data_found=ml_features_data["weather_data_found"],
-                contributing_factors=contributing_factors,
-                recommendation=recommendations.get(
-                    final_risk, recommendations[RiskLevel.UNKNOWN]
-                ),
-                error=threshold_result["details"].get("error"),
-            ),
+        failed = set(failed_indices)
+        saved = [
+            (report, report_doc)
+            for index, (report, report_doc) in enumerate(zip(batch.reports, report_docs))
+            if index not in failed
+        ]
+        # Echo the documents we already hold instead of reading them back
+        for _report, report_doc in saved:
+            report_doc["_id"] = str(report_doc["_id"])
+        invalidate_nearby_assessments(
+            [(report.latitude, report.longitude) for report, _report_doc in saved]
+        )
+
+        message = f"{len(saved)} reports received and analyzed successfully!"
+        if failed_indices:
+            response.status_code = 207
+            message = (
+                f"{len(saved)} of {len(report_docs)} reports saved; "
+                f"resend the reports at indices {failed_indices}."
+            )
+        return ReportBatchResponse(
+            message=message,
+            data=[Report(**report_doc) for _report, report_doc in saved],
+            failed_indices=failed_indices,
         )
+
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        raise HTTPException(
+            status_code=500, detail=f"Error creating reports: {str(exc)}"
+        ) from exc
+
+
+@app.get("/risk", response_model=RiskResponse)
+async def get_risk(
+    lat: float,
+    lon: float,
+    risk_service: RiskAssessmentService = Depends(get_risk_service),
+):
+    """Get a user-friendly, hybrid flood risk assessment for a location."""
+    try:
+        # Cached per grid bucket; invalidated when nearby reports arrive
+        return await risk_service.assess_risk(lat, lon)
     except Exception as exc:  # pylint: disable=broad-exception-caught
         raise HTTPException(
             status_code=500, detail=f"Error getting risk assessment: {str(exc)}"
@@ -0,0 +1,42 @@
+"""
+One-off migration: add the GeoJSON 'location' field to reports saved
+before it existed, so $geoWithin queries on the 2dsphere index see them.
+
+Run from the backend directory:
+    python -m scripts.backfill_report_location
+"""
+
+import pymongo
+
+from config.settings import DATABASE_NAME, MONGO_URI
+
+
+def backfill_report_location():
+    """Build location (lon, lat order) from latitude/longitude, server-side."""
+    client = pymongo.MongoClient(MONGO_URI)
+    try:
+        reports_collection = client[DATABASE_NAME].reports
+        result = reports_collection.update_many(
+            {
+                "location": {"$exists": False},
+                "latitude": {"$type": "number"},
+                "longitude": {"$type": "number"},
+            },
+            [
+                {
+                    "$set": {
+                        "location": {
+                            "type": "Point",
+                            "coordinates": ["$longitude", "$latitude"],
+                        }
+                    }
+                }
+            ],
+        )
+        print(f"✅ Added location to {result.modified_count} reports")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    backfill_report_location()
@@ -0,0 +1,47 @@
+"""
+Offline export of the flood model to a dynamically quantized ONNX file.
+
+Run from the backend directory:
+    python -m scripts.export_onnx_model
+
+Requires skl2onnx and onnxruntime (not needed to serve the API).
+FloodPredictor picks the exported file up automatically when present.
+"""
+
+import os
+
+import joblib
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import FloatTensorType
+
+from app.models.flood_predictor import N_FEATURES
+from config.settings import MODEL_PATH, ONNX_MODEL_PATH
+
+
+def export_onnx_model():
+    """Convert model.pkl to ONNX, then quantize its weights to int8."""
+    if not os.path.exists(MODEL_PATH):
+        print(f"❌ Model file not found: {MODEL_PATH}")
+        return
+
+    model = joblib.load(MODEL_PATH)
+    onnx_model = convert_sklearn(
+        model,
+        initial_types=[("X", FloatTensorType([None, N_FEATURES]))],
+        # Plain label/probability tensors instead of a list of dicts
+        options={id(model): {"zipmap": False}},
+    )
+
+    fp32_path = ONNX_MODEL_PATH.replace(".int8.onnx", ".onnx")
+    with open(fp32_path, "wb") as f:
+        f.write(onnx_model.SerializeToString())
+    print(f"💾 Exported float model to: {fp32_path}")
+
+    # Only MatMul/Gemm weights are quantized; tree ensembles pass through as-is
+    quantize_dynamic(fp32_path, ONNX_MODEL_PATH, weight_type=QuantType.QInt8)
+    print(f"✅ Quantized model saved to: {ONNX_MODEL_PATH}")
+
+
+if __name__ == "__main__":
+    export_onnx_model()
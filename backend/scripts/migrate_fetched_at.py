@@ -0,0 +1,42 @@
+"""
+One-off migration: convert string 'fetched_at' values in weather_data
+to BSON dates so range queries on the fetched_at index work.
+
+Run from the backend directory:
+    python -m scripts.migrate_fetched_at
+"""
+
+import pymongo
+
+from config.settings import DATABASE_NAME, MONGO_URI
+
+
+def migrate_fetched_at():
+    """Rewrite ISO-8601 string timestamps as native dates, server-side."""
+    client = pymongo.MongoClient(MONGO_URI)
+    try:
+        weather_collection = client[DATABASE_NAME].weather_data
+        result = weather_collection.update_many(
+            {"fetched_at": {"$type": "string"}},
+            [
+                {
+                    "$set": {
+                        "fetched_at": {
+                            "$convert": {
+                                "input": "$fetched_at",
+                                "to": "date",
+                                # Leave unparseable values as they are
+                                "onError": "$fetched_at",
+                            }
+                        }
+                    }
+                }
+            ],
+        )
+        print(f"✅ Converted fetched_at on {result.modified_count} weather documents")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    migrate_fetched_at()
@@ -25,7 +25,7 @@ if [ -d "venv" ]; then
 fi
 
 # Run the weather fetcher
-python3 app/services/weather_service.py
+python3 fetch_weather.py
 
 # Log the execution (optional)
 echo "$(date): Weather data fetch completed" >> "$PROJECT_ROOT/cron.log"
\ No newline at end of file